@@ -1,41 +1,170 @@
 import os
 import json
+import queue
+import atexit
 import logging
+import threading
+import time
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+from . import config
+from .redis_pool import get_client
+
 logger = logging.getLogger(__name__)
 
+# File writer batching: at most this many lines or this many seconds per write
+_BATCH_MAX_EVENTS = 64
+_BATCH_MAX_WAIT = 0.05
+_FILE_BUFFER_SIZE = 1 << 16
+# Queued by flush() to end the current batch without waiting out _BATCH_MAX_WAIT
+_FLUSH = object()
+
 
 def _now_iso() -> str:
+    # Full precision: events within the same second must stay distinguishable
     return datetime.now(timezone.utc).isoformat()
 
 
+def _dumps(event: dict) -> bytes:
+    """Serialize an event to compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(event)
+        except TypeError:
+            pass
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class _AuditFileWriter:
+    """Background writer appending audit lines through a long-lived buffered handle.
+
+    Lines are queued by `record_audit` and drained by a daemon thread in batches,
+    so the request path never pays for open/write/close per event. The handle is
+    reopened whenever the target path changes (e.g. the working directory moved).
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        # Also run in a forked child: the parent's writer thread doesn't exist there, and
+        # its queue/lock may be mid-use. The inherited handle is dropped, not closed, so
+        # the child never flushes the parent's buffered bytes a second time.
+        self._queue: "queue.Queue[tuple[str, bytes]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._fh = None
+        self._fh_path = None
+
+    def submit(self, path: str, line: bytes) -> None:
+        self._ensure_started()
+        self._queue.put_nowait((path, line))
+
+    def flush(self) -> None:
+        """Block until every queued line has been written and flushed."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            # Nothing is draining the queue; joining it would block forever
+            return
+        self._queue.put_nowait(_FLUSH)
+        self._queue.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="hub-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            taken = 1
+            batch = [] if item is _FLUSH else [item]
+            deadline = time.monotonic() + _BATCH_MAX_WAIT
+            while item is not _FLUSH and len(batch) < _BATCH_MAX_EVENTS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is not _FLUSH:
+                    batch.append(item)
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+    def _write(self, batch) -> None:
+        with self._lock:
+            for path, line in batch:
+                try:
+                    self._handle(path).write(line)
+                except Exception:
+                    logger.exception("Failed writing audit to file")
+            try:
+                if self._fh is not None:
+                    self._fh.flush()
+            except Exception:
+                logger.exception("Failed flushing audit file")
+
+    def _handle(self, path: str):
+        if self._fh is None or self._fh_path != path:
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                except Exception:
+                    logger.exception("Failed closing audit file")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._fh = open(path, "ab", buffering=_FILE_BUFFER_SIZE)
+            self._fh_path = path
+        return self._fh
+
+
+_file_writer = _AuditFileWriter()
+atexit.register(_file_writer.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_file_writer._reset)
+
+
+def flush_audit() -> None:
+    """Wait for pending file-backed audit events to reach `logs/audit.log`."""
+    _file_writer.flush()
+
+
 def record_audit(event: dict) -> None:
     """Record an audit event.
 
     Writes to Redis list `hub:audit` if `REDIS_URL` is set and redis is available.
-    Falls back to appending JSON lines to `logs/audit.log`.
+    Falls back to appending JSON lines to `logs/audit.log`; file writes are batched
+    by a background thread, call `flush_audit()` before reading the file back.
     """
     event_copy = dict(event)
     event_copy.setdefault("timestamp", _now_iso())
 
     # Try Redis first (best-effort)
-    redis_url = os.getenv("REDIS_URL")
+    redis_url = config.redis_url()
     if redis_url:
         try:
-            import redis
-
-            client = redis.from_url(redis_url, decode_responses=True)
-            client.rpush("hub:audit", json.dumps(event_copy))
+            get_client(redis_url).rpush("hub:audit", _dumps(event_copy))
             return
         except Exception:
             logger.exception("Failed writing audit to Redis; falling back to file")
 
-    # Ensure logs dir exists
+    # Resolve the path now so events land relative to the caller's working directory
     try:
-        os.makedirs("logs", exist_ok=True)
-        path = os.path.join("logs", "audit.log")
-        with open(path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(event_copy, ensure_ascii=False) + "\n")
+        path = os.path.abspath(os.path.join("logs", "audit.log"))
+        _file_writer.submit(path, _dumps(event_copy) + b"\n")
     except Exception:
         logger.exception("Failed writing audit to file")
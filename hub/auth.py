@@ -1,20 +1,76 @@
-import os
+import hmac
+import json
+import time
+import base64
+import hashlib
 import logging
+import threading
 from typing import Optional
 
+from . import config
+
 logger = logging.getLogger(__name__)
 
+# Verified JWT payloads, keyed by a digest of (token, secret)
+_JWT_CACHE_TTL = 5.0
+_JWT_CACHE_MAX = 1024
+_jwt_cache: dict[bytes, tuple[float, dict]] = {}
+_jwt_cache_lock = threading.Lock()
+
+
+# base64url of {"alg":"HS256","typ":"JWT"} — the header never changes, so encode it once
+_HS256_HEADER = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def encode_hs256_jwt(payload: dict, secret: str) -> str:
+    """Sign `payload` as a compact HS256 JWT, equivalent to `jwt.encode(payload, secret, algorithm="HS256")`."""
+    body = _b64url(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signing_input = _HS256_HEADER + b"." + body
+    sig = _b64url(hmac.new(secret.encode("utf-8"), signing_input, hashlib.sha256).digest())
+    return (signing_input + b"." + sig).decode("ascii")
+
+
+def _jwt_cache_key(token: str, secret: str) -> bytes:
+    return hashlib.blake2b(f"{token}\x00{secret}".encode("utf-8"), digest_size=16).digest()
+
 
 def _verify_jwt(token: str, secret: str) -> Optional[dict]:
+    """Verify an HS256 JWT, reusing a recent verification of the same token for a few seconds."""
+    now = time.time()
+    key = _jwt_cache_key(token, secret)
+    cached = _jwt_cache.get(key)
+    if cached is not None:
+        cached_at, payload = cached
+        exp = payload.get("exp")
+        if now - cached_at < _JWT_CACHE_TTL and (exp is None or exp > now):
+            return payload
+
     try:
         from jose import jwt
 
         payload = jwt.decode(token, secret, algorithms=["HS256"])
-        return payload
     except Exception:
         logger.exception("JWT verification failed")
         return None
 
+    with _jwt_cache_lock:
+        if len(_jwt_cache) >= _JWT_CACHE_MAX:
+            _jwt_cache.clear()
+        _jwt_cache[key] = (now, payload)
+    return payload
+
+
+def matches_admin_token(x_admin_token: Optional[str]) -> bool:
+    """Return True if `x_admin_token` equals the configured `ADMIN_TOKEN`, compared in constant time."""
+    admin_token = config.admin_token()
+    if not admin_token or not x_admin_token:
+        return False
+    return hmac.compare_digest(x_admin_token.encode("utf-8"), admin_token.encode("utf-8"))
+
 
 def is_admin(authorization: Optional[str], x_admin_token: Optional[str]) -> bool:
     """Return True if provided credentials authorize an admin action.
@@ -23,15 +79,15 @@ def is_admin(authorization: Optional[str], x_admin_token: Optional[str]) -> bool
     - `x_admin_token` matching `ADMIN_TOKEN` env var (legacy), or
     - `Authorization: Bearer <jwt>` where JWT verifies with `ADMIN_JWT_SECRET` and contains `role: admin`.
     """
-    admin_token = os.getenv("ADMIN_TOKEN")
-    if admin_token and x_admin_token and x_admin_token == admin_token:
+    if matches_admin_token(x_admin_token):
         return True
 
     # JWT-based admin
-    jwt_secret = os.getenv("ADMIN_JWT_SECRET")
+    jwt_secret = config.admin_jwt_secret()
     if jwt_secret and authorization:
-        if authorization.startswith("Bearer "):
-            token = authorization.split(" ", 1)[1]
+        # Scheme is case-insensitive (RFC 7235); slice instead of split to avoid a list
+        if authorization[:7].lower() == "bearer ":
+            token = authorization[7:]
             payload = _verify_jwt(token, jwt_secret)
             if not payload:
                 return False
@@ -0,0 +1,44 @@
+"""Process-wide configuration read from the environment.
+
+Values are resolved on first use and cached for the lifetime of the process so
+request handlers don't hit `os.environ` on every call. Call `reload_config()`
+after changing the environment (tests do this via `monkeypatch.setenv`).
+"""
+import os
+import functools
+from typing import Optional
+
+
+@functools.cache
+def admin_token() -> Optional[str]:
+    return os.getenv("ADMIN_TOKEN")
+
+
+@functools.cache
+def admin_jwt_secret() -> Optional[str]:
+    return os.getenv("ADMIN_JWT_SECRET")
+
+
+@functools.cache
+def redis_url() -> Optional[str]:
+    return os.getenv("REDIS_URL")
+
+
+@functools.cache
+def admin_auth_required() -> bool:
+    """True when any admin mechanism (legacy token or JWT secret) is configured."""
+    return bool(admin_token() or admin_jwt_secret())
+
+
+@functools.cache
+def rate_limit_per_min() -> int:
+    return int(os.getenv("RATE_LIMIT_PER_MIN", "60"))
+
+
+def reload_config() -> None:
+    """Drop cached values so the next access re-reads the environment."""
+    admin_token.cache_clear()
+    admin_jwt_secret.cache_clear()
+    redis_url.cache_clear()
+    admin_auth_required.cache_clear()
+    rate_limit_per_min.cache_clear()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 import os
 import threading
-import time
+from time import time as _now, time_ns as _now_ns
+from collections import deque
 from typing import Optional
 
 try:
@@ -9,53 +10,100 @@ try:
 except Exception:
     redis = None
 
+from .redis_pool import get_client
+
+
+_KEY_PREFIX = "rate:"
+
+# Number of independently locked partitions of in-memory state (power of two)
+_SHARD_COUNT = 32
+
+# Fixed-window counter: one INCR per request, TTL set when the window's key is created
+_FIXED_WINDOW_LUA = """
+local v = redis.call('INCR', KEYS[1])
+if tonumber(v) == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return v
+"""
+
 
 class RateLimiter:
     """Rate limiter with Redis backend when `REDIS_URL` is set, otherwise an in-memory fallback.
 
     Uses a sliding-window approach in-memory and a Redis sorted-set per client for accuracy across processes.
+    With `mode="fixed"` (or `RATE_LIMIT_MODE=fixed`) the Redis backend instead keeps a single
+    counter per client per window, trading sliding-window precision for O(1) memory per client.
     """
 
-    def __init__(self, window_seconds: int = 60, redis_url: Optional[str] = None):
+    def __init__(self, window_seconds: int = 60, redis_url: Optional[str] = None, mode: Optional[str] = None):
         self.window = window_seconds
         self.redis_url = redis_url or os.getenv("REDIS_URL")
-        self._lock = threading.Lock()
-        self._store: dict[str, list[float]] = {}
+        self.mode = (mode or os.getenv("RATE_LIMIT_MODE") or "sliding").lower()
+        # In-memory state is partitioned so unrelated clients don't contend on one lock
+        self._shards: list[tuple[dict[str, deque[float]], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(_SHARD_COUNT)
+        ]
         # Initialize redis client lazily
         self._redis = None
+        self._fixed_script = None
         if self.redis_url and redis:
             try:
-                self._redis = redis.from_url(self.redis_url, decode_responses=True)
+                # Replies are integers only (ZCARD / script counts); skip per-reply str decoding
+                self._redis = get_client(self.redis_url)
+                if self.mode == "fixed":
+                    self._fixed_script = self._redis.register_script(_FIXED_WINDOW_LUA)
             except Exception:
                 self._redis = None
+                self._fixed_script = None
+
+    def _shard(self, client_id: str) -> tuple[dict[str, deque[float]], threading.Lock]:
+        return self._shards[hash(client_id) & (_SHARD_COUNT - 1)]
+
+    def _fixed_key(self, client_id: str, now: float) -> str:
+        return _KEY_PREFIX + client_id + ":" + str(int(now // self.window))
 
     def allow_request(self, client_id: str, limit: int) -> bool:
         """Return True if the request is allowed (and record it), False if rate-limited."""
-        now = time.time()
-        if self._redis:
-            # Use sorted set with timestamps to implement sliding window
-            key = f"rate:{client_id}"
+        now = _now()
+        window = self.window
+        if self._fixed_script is not None:
+            try:
+                count = self._fixed_script(keys=[self._fixed_key(client_id, now)], args=[window * 1000])
+                return int(count) <= limit
+            except Exception:
+                # Fallback to in-memory on redis errors
+                pass
+        elif self._redis:
+            # Use sorted set with timestamps to implement sliding window.
+            # Integer nanosecond members are cheap to encode and don't collide like float seconds do.
+            key = _KEY_PREFIX + client_id
+            now_ns = _now_ns()
             try:
-                # Remove old
-                self._redis.zremrangebyscore(key, 0, now - self.window)
-                # Add current
-                self._redis.zadd(key, {str(now): now})
-                # Count
-                cnt = self._redis.zcard(key)
+                # One round-trip: trim old entries, add current, count, refresh TTL
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.zremrangebyscore(key, 0, now_ns - window * 1_000_000_000)
+                pipe.zadd(key, {now_ns: now_ns})
+                pipe.zcard(key)
                 # Set TTL slightly longer than window
-                self._redis.expire(key, self.window + 5)
+                pipe.expire(key, window + 5)
+                _, _, cnt, _ = pipe.execute()
                 return cnt <= limit
             except Exception:
                 # Fallback to in-memory on redis errors
                 pass
 
         # In-memory fallback
-        with self._lock:
-            bucket = self._store.setdefault(client_id, [])
-            cutoff = now - self.window
+        store, lock = self._shard(client_id)
+        with lock:
+            bucket = store.get(client_id)
+            if bucket is None:
+                bucket = store[client_id] = deque()
+            cutoff = now - window
             # remove old timestamps
+            popleft = bucket.popleft
             while bucket and bucket[0] < cutoff:
-                bucket.pop(0)
+                popleft()
             if len(bucket) >= limit:
                 return False
             bucket.append(now)
@@ -66,15 +114,18 @@ class RateLimiter:
         if self._redis and self.redis_url:
             try:
                 if client_id:
-                    self._redis.delete(f"rate:{client_id}")
+                    self._redis.delete(_KEY_PREFIX + client_id, self._fixed_key(client_id, _now()))
                 else:
                     # No reliable cross-process way to clear all keys safely; skip
                     pass
             except Exception:
                 pass
 
-        with self._lock:
-            if client_id:
-                self._store.pop(client_id, None)
-            else:
-                self._store.clear()
+        if client_id:
+            store, lock = self._shard(client_id)
+            with lock:
+                store.pop(client_id, None)
+        else:
+            for store, lock in self._shards:
+                with lock:
+                    store.clear()
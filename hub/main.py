@@ -1,15 +1,27 @@
-from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi import FastAPI, HTTPException, Header, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
-import json
 from datetime import datetime, timezone
+import asyncio
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+else:
+    from json import loads as _json_loads
+
 from .session_store import create_default_store
-from .audit import record_audit
-from .auth import is_admin
+from .audit import record_audit, flush_audit
+from .auth import is_admin, matches_admin_token, encode_hs256_jwt
+from . import config
 from .limiter import RateLimiter
+from .redis_pool import get_client
 import os
 from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
 from fastapi.responses import Response
@@ -59,21 +71,24 @@ class Session(BaseModel):
     start_time: datetime | None = None
     last_activity: datetime | None = None
 
+# Pre-serialized probe body; load balancers hit /health constantly
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 @app.get("/api/health/clients")
 async def clients():
     # Mock data for the skeleton. Replace with real session registry in implementation.
     # Use timezone-aware UTC datetimes to avoid deprecation warnings.
     sessions = session_store.list_sessions()
+    users = {u for s in sessions if (u := s.get("user"))}
     now = datetime.now(timezone.utc).isoformat()
-    total_active_sessions = len(sessions)
-    total_active_users = len({s.get("user") for s in sessions if s.get("user")})
     return {
-        "total_active_sessions": total_active_sessions,
-        "total_active_users": total_active_users,
+        "total_active_sessions": len(sessions),
+        "total_active_users": len(users),
         "last_refresh": now,
         "sessions": sessions,
     }
@@ -87,16 +102,14 @@ async def create_client(user: str = "anonymous", role: str = "Viewer", device: s
 
 
 @app.post("/api/clients/{session_id}/terminate")
-async def terminate_client(session_id: str, request: Request, authorization: str | None = Header(None), x_admin_token: str | None = Header(None)):
+async def terminate_client(session_id: str, request: Request, background_tasks: BackgroundTasks, authorization: str | None = Header(None), x_admin_token: str | None = Header(None)):
     # Enforce admin RBAC only if an admin mechanism is configured.
-    admin_token = os.getenv("ADMIN_TOKEN")
-    jwt_secret = os.getenv("ADMIN_JWT_SECRET")
-    if admin_token or jwt_secret:
+    if config.admin_auth_required():
         if not is_admin(authorization, x_admin_token):
             raise HTTPException(status_code=403, detail="admin credentials required")
 
     # Rate limiting: allow `RATE_LIMIT_PER_MIN` requests per minute per client IP (default 60)
-    limit = int(os.getenv('RATE_LIMIT_PER_MIN', '60'))
+    limit = config.rate_limit_per_min()
     try:
         client_ip = (request.client and request.client.host) or 'unknown'
     except Exception:
@@ -109,70 +122,105 @@ async def terminate_client(session_id: str, request: Request, authorization: str
 
     MET_TERMINATE_ATTEMPTS.inc()
 
-    ok = session_store.terminate_session(session_id)
+    # The store may block on Redis round-trips; keep it off the event loop
+    ok = await asyncio.to_thread(session_store.terminate_session, session_id)
     if not ok:
         raise HTTPException(status_code=404, detail="session not found")
 
-    # Audit the action
-    try:
-        record_audit({
-            "action": "terminate_session",
-            "session_id": session_id,
-            "by": "admin",
-        })
-    except Exception:
-        # auditing is best-effort; don't fail the request on audit error
-        pass
+    # Audit the action after the response is sent; auditing is best-effort and
+    # record_audit swallows its own backend errors
+    background_tasks.add_task(record_audit, {
+        "action": "terminate_session",
+        "session_id": session_id,
+        "by": "admin",
+    })
 
     return {"status": "terminated", "session_id": session_id}
 
 
+# Rendered exposition text is reused for this long; scrapes within the window see the same snapshot
+METRICS_CACHE_TTL_SECONDS = 1.0
+_metrics_cache = {"ts": 0.0, "body": b""}
+
+
 @app.get('/metrics')
 async def metrics():
     """Expose Prometheus metrics."""
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    now = time.monotonic()
+    if not _metrics_cache["body"] or now - _metrics_cache["ts"] >= METRICS_CACHE_TTL_SECONDS:
+        _metrics_cache["body"] = generate_latest()
+        _metrics_cache["ts"] = now
+    return Response(_metrics_cache["body"], media_type=CONTENT_TYPE_LATEST)
+
+
+_TAIL_BLOCK_SIZE = 8192
+
+
+def _tail_lines(path: str, n: int) -> List[str]:
+    """Return the last `n` lines of a UTF-8 file, reading backwards from EOF in fixed-size blocks.
+
+    Memory and I/O are proportional to the returned lines, not the file size.
+    Lines are split on `\n` only (JSON strings may contain U+2028 and friends) and
+    returned without the newline. For non-positive `n` the result matches
+    `readlines()[-n:]`, which reads the whole file.
+    """
+    with open(path, "rb") as fh:
+        if n <= 0:
+            data = fh.read()
+        else:
+            fh.seek(0, os.SEEK_END)
+            pos = fh.tell()
+            blocks = []
+            newlines = 0
+            # n+1 newlines guarantee n complete lines even if the first block starts mid-line
+            while pos > 0 and newlines <= n:
+                step = min(_TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                fh.seek(pos)
+                block = fh.read(step)
+                newlines += block.count(b"\n")
+                blocks.append(block)
+            data = b"".join(reversed(blocks))
+    pieces = data.split(b"\n")
+    if pieces and not pieces[-1]:
+        pieces.pop()
+    return [ln.decode("utf-8", errors="replace") for ln in pieces[-n:]]
 
 
 @app.get("/api/ops/audit")
-async def get_audit(request: Request, limit: int = 100):
+async def get_audit(limit: int = 100, authorization: str | None = Header(None), x_admin_token: str | None = Header(None)):
     """Return recent audit events. Tries Redis `hub:audit` list first, falls back to `logs/audit.log`.
 
     If `ADMIN_TOKEN` or `ADMIN_JWT_SECRET` is configured the endpoint requires admin credentials.
     """
     # Enforce admin RBAC if configured
-    admin_token = os.getenv("ADMIN_TOKEN")
-    jwt_secret = os.getenv("ADMIN_JWT_SECRET")
-    if admin_token or jwt_secret:
-        auth_header = request.headers.get("authorization")
-        x_admin = request.headers.get("x-admin-token")
-        if not is_admin(auth_header, x_admin):
+    if config.admin_auth_required():
+        if not is_admin(authorization, x_admin_token):
             raise HTTPException(status_code=403, detail="admin credentials required")
 
-    redis_url = os.getenv("REDIS_URL")
+    redis_url = config.redis_url()
     events = []
     if redis_url:
         try:
-            import redis
-            client = redis.from_url(redis_url, decode_responses=True)
-            raw = client.lrange("hub:audit", -limit, -1)
+            raw = get_client(redis_url, decode_responses=True).lrange("hub:audit", -limit, -1)
             for item in raw:
                 try:
-                    events.append(json.loads(item))
+                    events.append(_json_loads(item))
                 except Exception:
                     events.append({"raw": item})
             return {"events": events}
         except Exception:
             pass
 
-    # Fallback to file
+    # Fallback to file; drain the background writer so recent events are visible
+    await asyncio.to_thread(flush_audit)
     path = os.path.join("logs", "audit.log")
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as fh:
-                lines = fh.readlines()[-limit:]
+            lines = _tail_lines(path, limit)
             for ln in lines:
                 try:
-                    events.append(json.loads(ln))
+                    events.append(_json_loads(ln))
                 except Exception:
                     events.append({"raw": ln.strip()})
         except Exception:
@@ -188,29 +236,24 @@ async def mint_admin_token(x_admin_token: str | None = Header(None)):
     Requires `ADMIN_JWT_SECRET` to be set. This is a dev-friendly helper; replace
     with a proper auth server in production.
     """
-    admin_token = os.getenv("ADMIN_TOKEN")
-    jwt_secret = os.getenv("ADMIN_JWT_SECRET")
+    jwt_secret = config.admin_jwt_secret()
 
     if not jwt_secret:
         raise HTTPException(status_code=400, detail="ADMIN_JWT_SECRET not configured")
 
-    if not admin_token or x_admin_token != admin_token:
+    if not matches_admin_token(x_admin_token):
         raise HTTPException(status_code=403, detail="invalid admin token")
 
     # create a token with role=admin
     try:
-        from jose import jwt
-        from datetime import timedelta
-        from datetime import datetime as _dt
-
-        now = _dt.now(timezone.utc)
+        now = datetime.now(timezone.utc)
         payload = {
             "sub": "admin",
             "role": "admin",
             "iat": int(now.timestamp()),
             "exp": int((now + timedelta(minutes=30)).timestamp()),
         }
-        token = jwt.encode(payload, jwt_secret, algorithm="HS256")
+        token = encode_hs256_jwt(payload, jwt_secret)
         return {"access_token": token, "token_type": "bearer"}
     except Exception as e:
         raise HTTPException(status_code=500, detail="token generation failed")
@@ -0,0 +1,44 @@
+"""Process-wide Redis clients.
+
+Every module that talks to Redis goes through `get_client`, so a worker process
+holds one connection pool per (URL, decode_responses) pair instead of one per
+store, limiter and request.
+
+Pools are `BlockingConnectionPool`s: once `MAX_CONNECTIONS` are checked out, further
+callers (e.g. Starlette's worker threads plus the `asyncio.to_thread` executor) wait up
+to `POOL_TIMEOUT_SECONDS` for a free connection instead of failing immediately.
+"""
+import threading
+from typing import Any, Dict, Tuple
+
+MAX_CONNECTIONS = 50
+POOL_TIMEOUT_SECONDS = 5
+
+_clients: Dict[Tuple[str, bool], Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(redis_url: str, *, decode_responses: bool = False):
+    """Return the shared client for `redis_url`, creating its pool on first use.
+
+    `unix://` URLs connect over a Unix domain socket; TCP URLs use keep-alive.
+    """
+    key = (redis_url, decode_responses)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import redis
+
+            kwargs = {
+                "decode_responses": decode_responses,
+                "max_connections": MAX_CONNECTIONS,
+                "timeout": POOL_TIMEOUT_SECONDS,
+            }
+            if not redis_url.startswith("unix://"):
+                kwargs["socket_keepalive"] = True
+            pool = redis.BlockingConnectionPool.from_url(redis_url, **kwargs)
+            client = _clients[key] = redis.Redis(connection_pool=pool)
+        return client
@@ -1,126 +1,326 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime, timezone
-import uuid
+from os import urandom
 import os
+import time
+import atexit
+import threading
 import json
 import logging
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+from .redis_pool import get_client
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_UTC = timezone.utc
+
+
+# Burst session writes within this window share one formatted timestamp
+_NOW_CACHE_SECONDS = 0.01
+# (epoch seconds, ISO string) of the last formatted timestamp
+_last_now: tuple = (0.0, "")
+
+
+def _now_iso() -> str:
+    global _last_now
+    t = time.time()
+    cached_t, cached_iso = _last_now
+    if 0 <= t - cached_t < _NOW_CACHE_SECONDS:
+        return cached_iso
+    iso = datetime.fromtimestamp(t, _UTC).isoformat()
+    _last_now = (t, iso)
+    return iso
+
+
+def _new_session(user: str, role: str, device: Optional[str], store: Optional[str], module: Optional[str], connection_type: Optional[str]) -> Dict[str, Any]:
+    session_id = urandom(16).hex()
+    now = _now_iso()
+    return {
+        "session_id": session_id,
+        "user": user,
+        "role": role,
+        "device": device,
+        "store": store,
+        "module": module,
+        "connection_type": connection_type,
+        "start_time": now,
+        "last_activity": now,
+    }
+
+
+_MISSING = object()
+
+# Ids per ZSCAN page / MGET call when listing Redis sessions
+_LIST_BATCH_SIZE = 500
+
+# Redis session lifetime; blobs expire on their own and index scores hold the expiry time
+DEFAULT_SESSION_TTL_SECONDS = 24 * 60 * 60
+# Expired index entries are pruned by list_sessions at most this often
+_INDEX_PRUNE_INTERVAL = 60.0
+
+# Blob write and index update as one atomic server-side step.
+# KEYS: blob key, index key. ARGV: blob, ttl seconds, expiry score, session id.
+_CREATE_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+return 1
+"""
+
+# KEYS: blob key, index key. ARGV: session id. Returns 1 if the blob existed.
+_TERMINATE_LUA = """
+local existed = redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return existed
+"""
+
+
 class InMemorySessionStore:
     def __init__(self):
         self.sessions: Dict[str, Dict[str, Any]] = {}
 
-    def _now(self) -> str:
-        return datetime.now(timezone.utc).isoformat()
-
     def create_session(self, user: str, role: str, device: Optional[str] = None, store: Optional[str] = None, module: Optional[str] = None, connection_type: Optional[str] = None) -> Dict[str, Any]:
-        session_id = str(uuid.uuid4())
-        now = self._now()
-        s = {
-            "session_id": session_id,
-            "user": user,
-            "role": role,
-            "device": device,
-            "store": store,
-            "module": module,
-            "connection_type": connection_type,
-            "start_time": now,
-            "last_activity": now,
-        }
+        s = _new_session(user, role, device, store, module, connection_type)
+        session_id = s["session_id"]
         self.sessions[session_id] = s
         return s
 
     def list_sessions(self, *, since_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
-        # since_seconds unused for now; return all
-        return list(self.sessions.values())
+        if not since_seconds:
+            return list(self.sessions.values())
+        cutoff = datetime.fromtimestamp(time.time() - since_seconds, timezone.utc)
+        return [s for s in self.sessions.values() if datetime.fromisoformat(s["last_activity"]) >= cutoff]
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         return self.sessions.get(session_id)
 
     def terminate_session(self, session_id: str) -> bool:
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        return self.sessions.pop(session_id, _MISSING) is not _MISSING
 
 
 class RedisSessionStore:
-    """A simple Redis-backed session store using JSON blobs. Not highly optimized — suitable for MVP."""
-    def __init__(self, redis_url: str):
-        try:
-            import redis
+    """A simple Redis-backed session store using JSON blobs — suitable for MVP.
+
+    Blobs are written with a TTL and session ids are indexed in a sorted set scored by
+    their expiry time (unix seconds), so expired sessions need no read-time cleanup and
+    `list_sessions(since_seconds=...)` is a range query instead of a full scan.
+    """
+    # Key names are fixed; class constants avoid per-instance construction
+    prefix = "hub:session:"
+    index_key = "hub:sessions:zset"
+    # Unordered id set used before the sorted-set index existed
+    legacy_set_key = "hub:sessions"
 
-            self.client = redis.from_url(redis_url, decode_responses=True)
+    def __init__(self, redis_url: Optional[str] = None, *, unix_socket_path: Optional[str] = None, ttl_seconds: int = DEFAULT_SESSION_TTL_SECONDS):
+        # Co-located Redis over a Unix socket skips the TCP/IP stack entirely
+        target = f"unix://{unix_socket_path}" if unix_socket_path else redis_url
+        try:
+            # Raw bytes replies: blobs go straight to the JSON decoder without a str round-trip
+            self.client = get_client(target)
             # test connection
             self.client.ping()
         except Exception as e:
-            logger.exception("Failed to connect to Redis at %s: %s", redis_url, e)
+            logger.exception("Failed to connect to Redis at %s: %s", target, e)
             raise
 
-        self.prefix = "hub:session:"
-        self.set_key = "hub:sessions"
+        self.ttl_seconds = ttl_seconds
+        self._last_prune = 0.0
+        # Sent with EVALSHA; redis-py reloads the script on NOSCRIPT
+        self._create_script = self.client.register_script(_CREATE_LUA)
+        self._terminate_script = self.client.register_script(_TERMINATE_LUA)
+        self._migrate_legacy_index()
 
-    def _key(self, session_id: str) -> str:
-        return f"{self.prefix}{session_id}"
+    def _migrate_legacy_index(self) -> None:
+        """Move ids from the legacy `hub:sessions` set into the sorted-set index (one-time).
 
-    def _now(self) -> str:
-        return datetime.now(timezone.utc).isoformat()
+        Legacy blobs were written without a TTL; they get one here so they expire with
+        their index entry instead of outliving it.
+        """
+        try:
+            ids = self.client.smembers(self.legacy_set_key)
+            if ids:
+                expires_at = time.time() + self.ttl_seconds
+                pipe = self.client.pipeline(transaction=False)
+                pipe.zadd(self.index_key, {sid: expires_at for sid in ids})
+                for sid in ids:
+                    pipe.expire(self.prefix + sid.decode("utf-8"), self.ttl_seconds)
+                pipe.delete(self.legacy_set_key)
+                pipe.execute()
+        except Exception:
+            logger.exception("Failed migrating legacy session index")
+
+    def _key(self, session_id: str) -> str:
+        return self.prefix + session_id
 
     def create_session(self, user: str, role: str, device: Optional[str] = None, store: Optional[str] = None, module: Optional[str] = None, connection_type: Optional[str] = None) -> Dict[str, Any]:
-        session_id = str(uuid.uuid4())
-        now = self._now()
-        s = {
-            "session_id": session_id,
-            "user": user,
-            "role": role,
-            "device": device,
-            "store": store,
-            "module": module,
-            "connection_type": connection_type,
-            "start_time": now,
-            "last_activity": now,
-        }
-        key = self._key(session_id)
-        self.client.set(key, json.dumps(s))
-        self.client.sadd(self.set_key, session_id)
+        s = _new_session(user, role, device, store, module, connection_type)
+        session_id = s["session_id"]
+        # One atomic round-trip, so a crash can't leave an index entry without a blob
+        self._create_script(
+            keys=[self._key(session_id), self.index_key],
+            args=[_dumps(s), self.ttl_seconds, time.time() + self.ttl_seconds, session_id],
+        )
         return s
 
+    def _iter_index_ids(self, since_seconds: Optional[int]) -> Iterator[bytes]:
+        now = time.time()
+        if since_seconds:
+            # Recency query only touches the active tail of the index; a session created
+            # `since_seconds` ago expires `ttl_seconds` after that.
+            low = max(now, now - since_seconds + self.ttl_seconds)
+            yield from self.client.zrangebyscore(self.index_key, f"({low}", "+inf")
+            return
+        # Full listing: walk the index with a cursor instead of one unbounded reply.
+        # SCAN may repeat members, so de-duplicate; expired entries are skipped.
+        seen = set()
+        for sid, expires_at in self.client.zscan_iter(self.index_key, count=_LIST_BATCH_SIZE):
+            if expires_at > now and sid not in seen:
+                seen.add(sid)
+                yield sid
+
+    def _prune_index(self) -> None:
+        """Drop expired ids from the index, at most once per `_INDEX_PRUNE_INTERVAL`."""
+        now = time.time()
+        if now - self._last_prune < _INDEX_PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        try:
+            self.client.zremrangebyscore(self.index_key, "-inf", now)
+        except Exception:
+            logger.exception("Failed pruning expired session ids")
+
     def list_sessions(self, *, since_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
-        ids = self.client.smembers(self.set_key) or []
         out = []
-        for sid in ids:
-            try:
-                raw = self.client.get(self._key(sid))
+        batch: List[str] = []
+        pfx = self.prefix
+
+        def _fetch(batch_ids: List[str]) -> None:
+            # One MGET per batch instead of a GET per id
+            raws = self.client.mget([pfx + sid for sid in batch_ids])
+            for sid, raw in zip(batch_ids, raws):
                 if not raw:
-                    # cleanup
-                    self.client.srem(self.set_key, sid)
                     continue
-                out.append(json.loads(raw))
-            except Exception:
-                logger.exception("Failed reading session %s", sid)
+                try:
+                    out.append(_loads(raw))
+                except Exception:
+                    logger.exception("Failed reading session %s", sid)
+
+        for sid in self._iter_index_ids(since_seconds):
+            # Replies are raw bytes; ids are needed as str to build blob keys
+            batch.append(sid.decode("utf-8"))
+            if len(batch) >= _LIST_BATCH_SIZE:
+                _fetch(batch)
+                batch = []
+        if batch:
+            _fetch(batch)
+        self._prune_index()
         return out
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         raw = self.client.get(self._key(session_id))
         if not raw:
             return None
-        return json.loads(raw)
+        return _loads(raw)
 
     def terminate_session(self, session_id: str) -> bool:
-        key = self._key(session_id)
-        existed = self.client.delete(key)
-        self.client.srem(self.set_key, session_id)
+        existed = self._terminate_script(keys=[self._key(session_id), self.index_key], args=[session_id])
         return existed == 1
 
 
+class BufferedRedisSessionStore(RedisSessionStore):
+    """RedisSessionStore that batches `create_session` writes.
+
+    New sessions are held in-process and written by a single pipeline at most
+    `flush_interval` seconds later, so a burst of N creations costs one round-trip
+    instead of N. Reads see buffered sessions immediately. Trade-off: sessions
+    created within the last flush interval are lost if the process dies before the
+    flush, and other processes only see them after it.
+    """
+    def __init__(self, redis_url: Optional[str] = None, *, unix_socket_path: Optional[str] = None, ttl_seconds: int = DEFAULT_SESSION_TTL_SECONDS, flush_interval: float = 0.01):
+        super().__init__(redis_url, unix_socket_path=unix_socket_path, ttl_seconds=ttl_seconds)
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        # Serializes pipeline writes against terminate so a flush can't resurrect a session
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def create_session(self, user: str, role: str, device: Optional[str] = None, store: Optional[str] = None, module: Optional[str] = None, connection_type: Optional[str] = None) -> Dict[str, Any]:
+        s = _new_session(user, role, device, store, module, connection_type)
+        session_id = s["session_id"]
+        with self._pending_lock:
+            self._pending[session_id] = s
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return s
+
+    def flush(self) -> None:
+        """Write all buffered sessions to Redis in one pipeline."""
+        with self._flush_lock:
+            with self._pending_lock:
+                self._timer = None
+                batch = dict(self._pending)
+            if not batch:
+                return
+            expires_at = time.time() + self.ttl_seconds
+            pipe = self.client.pipeline(transaction=False)
+            for session_id, s in batch.items():
+                pipe.set(self._key(session_id), _dumps(s), ex=self.ttl_seconds)
+            pipe.zadd(self.index_key, {session_id: expires_at for session_id in batch})
+            try:
+                pipe.execute()
+            except Exception:
+                # Keep the sessions buffered; the next create_session or flush retries
+                logger.exception("Failed flushing %d buffered sessions", len(batch))
+                return
+            with self._pending_lock:
+                for session_id in batch:
+                    self._pending.pop(session_id, None)
+
+    def list_sessions(self, *, since_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
+        self.flush()
+        return super().list_sessions(since_seconds=since_seconds)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        s = self._pending.get(session_id)
+        if s is not None:
+            return s
+        return super().get_session(session_id)
+
+    def terminate_session(self, session_id: str) -> bool:
+        with self._flush_lock:
+            with self._pending_lock:
+                buffered = self._pending.pop(session_id, _MISSING) is not _MISSING
+            return super().terminate_session(session_id) or buffered
+
+
 # Factory to pick backend (Redis or in-memory)
 def create_default_store():
+    redis_socket = os.getenv("REDIS_SOCKET")
     redis_url = os.getenv("REDIS_URL")
-    if redis_url:
+    if redis_socket or redis_url:
+        buffer_ms = os.getenv("REDIS_SESSION_BUFFER_MS")
+        ttl_seconds = int(os.getenv("SESSION_TTL_SECONDS", DEFAULT_SESSION_TTL_SECONDS))
         try:
-            return RedisSessionStore(redis_url)
+            if buffer_ms:
+                return BufferedRedisSessionStore(redis_url, unix_socket_path=redis_socket, ttl_seconds=ttl_seconds, flush_interval=int(buffer_ms) / 1000)
+            return RedisSessionStore(redis_url, unix_socket_path=redis_socket, ttl_seconds=ttl_seconds)
         except Exception:
             logger.warning("Falling back to in-memory session store")
     return InMemorySessionStore()
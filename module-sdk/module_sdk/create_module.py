@@ -3,6 +3,7 @@ Usage: python -m module_sdk.create_module --name "My Module" --id com.example.my
 """
 import argparse
 from pathlib import Path
+from string import Template
 import json
 
 MANIFEST_TEMPLATE = {
@@ -18,21 +19,19 @@ MANIFEST_TEMPLATE = {
     "upgrade_path": None
 }
 
-README = """# Module: {name}
+README = Template("""# Module: $name
 
 This is a scaffolded module. Fill in implementation and manifest.
-"""
+""")
 
 
 def scaffold(name: str, id_: str, out: Path):
     out.mkdir(parents=True, exist_ok=True)
-    manifest = MANIFEST_TEMPLATE.copy()
-    manifest['name'] = name
-    manifest['id'] = id_
+    manifest = {**MANIFEST_TEMPLATE, "name": name, "id": id_}
     with open(out / 'manifest.json', 'w', encoding='utf-8') as f:
         json.dump(manifest, f, indent=2)
     with open(out / 'README.md', 'w', encoding='utf-8') as f:
-        f.write(README.format(name=name))
+        f.write(README.substitute(name=name))
     (out / 'src').mkdir(exist_ok=True)
     with open(out / 'src' / '__init__.py', 'w', encoding='utf-8') as f:
         f.write('# module code')
@@ -1,7 +1,10 @@
 import json
 import sys
+import functools
 from pathlib import Path
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 SCHEMA_PATH = Path(__file__).resolve().parents[2] / "docs" / "manifests" / "manifest-schema.json"
 
@@ -10,12 +13,23 @@ def load_schema():
         return json.load(f)
 
 
-def validate_manifest(manifest_path: str) -> bool:
+@functools.lru_cache(maxsize=1)
+def _compiled_validator():
+    """Load, check and compile the manifest schema once per process."""
     schema = load_schema()
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def validate_manifest(manifest_path: str) -> bool:
     with open(manifest_path, 'r', encoding='utf-8') as f:
         manifest = json.loads(f.read())
     try:
-        validate(instance=manifest, schema=schema)
+        # Same error selection as jsonschema.validate()
+        error = best_match(_compiled_validator().iter_errors(manifest))
+        if error is not None:
+            raise error
         print("Manifest is valid")
         return True
     except ValidationError as e:
@@ -0,0 +1,21 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from hub.config import reload_config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config():
+    # Config values are cached per process; re-read the environment around each test
+    reload_config()
+    yield
+    reload_config()
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One TestClient for the whole run; tests reset the mutable state they touch
+    from hub.main import app
+
+    with TestClient(app) as c:
+        yield c
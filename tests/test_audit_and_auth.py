@@ -1,12 +1,16 @@
 import os
 import json
 import time
+import pytest
 from fastapi.testclient import TestClient
 
 from hub.main import app
+from hub.config import reload_config
+from hub.audit import flush_audit, record_audit
 
 
 def _read_audit_file():
+    flush_audit()
     path = os.path.join("logs", "audit.log")
     if not os.path.exists(path):
         return []
@@ -22,6 +26,7 @@ def test_admin_token_rbac(tmp_path, monkeypatch):
 
     # set legacy admin token
     monkeypatch.setenv("ADMIN_TOKEN", "secrettoken123")
+    reload_config()
 
     client = TestClient(app)
 
@@ -47,6 +52,7 @@ def test_jwt_admin_rbac(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     # set JWT secret
     monkeypatch.setenv("ADMIN_JWT_SECRET", "jwtsecret")
+    reload_config()
 
     # create JWT
     from jose import jwt
@@ -71,6 +77,7 @@ def test_mint_token_endpoint(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("ADMIN_TOKEN", "legacy-token")
     monkeypatch.setenv("ADMIN_JWT_SECRET", "jwtsecret")
+    reload_config()
 
     client = TestClient(app)
     # request a token using legacy header
@@ -85,3 +92,26 @@ def test_mint_token_endpoint(tmp_path, monkeypatch):
     sid = r2.json()["session_id"]
     r3 = client.post(f"/api/clients/{sid}/terminate", headers={"Authorization": f"Bearer {token}"})
     assert r3.status_code == 200
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_flush_audit_after_fork_does_not_hang(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    record_audit({"action": "before_fork"})
+    flush_audit()
+
+    pid = os.fork()
+    if pid == 0:
+        # Child: the parent's writer thread is gone; flushing must not block on its queue
+        import signal
+        signal.alarm(5)
+        try:
+            flush_audit()
+            record_audit({"action": "in_child"})
+            flush_audit()
+        finally:
+            os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    actions = [e.get("action") for e in _read_audit_file()]
+    assert actions == ["before_fork", "in_child"]
@@ -2,11 +2,13 @@ import os
 from fastapi.testclient import TestClient
 
 from hub.main import app
+from hub.config import reload_config
 
 
 def test_audit_rbac_legacy_token(monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("ADMIN_TOKEN", "admintoken123")
+    reload_config()
     client = TestClient(app)
 
     # without header should be forbidden
@@ -23,6 +25,7 @@ def test_audit_rbac_jwt(monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("ADMIN_TOKEN", "legacytoken")
     monkeypatch.setenv("ADMIN_JWT_SECRET", "jwtsecret")
+    reload_config()
     client = TestClient(app)
 
     # mint a token
@@ -0,0 +1,12 @@
+import json
+
+from module_sdk.create_module import MANIFEST_TEMPLATE, scaffold
+
+
+def test_scaffold_writes_name_and_id(tmp_path):
+    # name equal to the template id must not be confused with the id field
+    scaffold(MANIFEST_TEMPLATE['id'], 'org.acme.real', tmp_path)
+    manifest = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))
+    assert manifest['name'] == MANIFEST_TEMPLATE['id']
+    assert manifest['id'] == 'org.acme.real'
+    assert manifest['version'] == MANIFEST_TEMPLATE['version']
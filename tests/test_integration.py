@@ -4,6 +4,7 @@ import pytest
 RUN_INTEGRATION = os.getenv("RUN_INTEGRATION") == "1"
 
 
+@pytest.mark.io
 @pytest.mark.skipif(not RUN_INTEGRATION, reason="Integration tests disabled")
 def test_redis_session_store_integration():
     """Integration test for RedisSessionStore.
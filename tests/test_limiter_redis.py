@@ -4,14 +4,17 @@ import time
 from fastapi.testclient import TestClient
 
 from hub.main import app, limiter
+from hub.config import reload_config
 
 
+@pytest.mark.io
 @pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
 def test_rate_limiter_redis_integration(tmp_path):
     # This test requires a running Redis instance specified by REDIS_URL
     client = TestClient(app)
     limiter.clear()
     os.environ['RATE_LIMIT_PER_MIN'] = '2'
+    reload_config()
 
     r = client.post('/api/clients/create', params={'user': 'redis-int'})
     assert r.status_code == 200
@@ -25,3 +28,18 @@ def test_rate_limiter_redis_integration(tmp_path):
 
     r3 = client.post(f'/api/clients/{sid}/terminate')
     assert r3.status_code == 429
+
+
+@pytest.mark.io
+@pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
+def test_rate_limiter_redis_fixed_window():
+    from hub.limiter import RateLimiter
+
+    rl = RateLimiter(window_seconds=60, mode='fixed')
+    client_id = 'fixed-window-test'
+    rl.clear(client_id)
+
+    assert rl.allow_request(client_id, 2) is True
+    assert rl.allow_request(client_id, 2) is True
+    assert rl.allow_request(client_id, 2) is False
+    rl.clear(client_id)
@@ -1,21 +1,21 @@
-import os
-import time
-from fastapi.testclient import TestClient
+import pytest
 
-from hub.main import app
+from hub import main as hub_main
+from hub.config import reload_config
 
 
-def test_terminate_rate_limit(monkeypatch, tmp_path):
+@pytest.fixture(autouse=True)
+def _reset_limiter():
+    # The shared app keeps limiter state across tests
+    hub_main.limiter.clear()
+    yield
+
+
+def test_terminate_rate_limit(client, monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
     # set a low rate limit
     monkeypatch.setenv('RATE_LIMIT_PER_MIN', '2')
-    # Ensure limiter state is cleared between tests
-    import hub.main as hub_main
-    try:
-        hub_main.limiter.clear()
-    except Exception:
-        pass
-    client = TestClient(app)
+    reload_config()
 
     # create a session
     r = client.post('/api/clients/create', params={'user': 'rltest'})
@@ -38,9 +38,8 @@ def test_terminate_rate_limit(monkeypatch, tmp_path):
     assert r3.status_code == 429
 
 
-def test_metrics_endpoint(monkeypatch, tmp_path):
+def test_metrics_endpoint(client, monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
-    client = TestClient(app)
     r = client.get('/metrics')
     assert r.status_code == 200
     # should contain prometheus metrics header
@@ -0,0 +1,12 @@
+from hub.session_store import InMemorySessionStore
+
+
+def test_in_memory_list_sessions_since_seconds():
+    store = InMemorySessionStore()
+    recent = store.create_session(user='recent', role='Viewer')
+    stale = store.create_session(user='stale', role='Viewer')
+    stale['last_activity'] = '2000-01-01T00:00:00+00:00'
+
+    assert len(store.list_sessions()) == 2
+    ids = [s['session_id'] for s in store.list_sessions(since_seconds=60)]
+    assert ids == [recent['session_id']]
@@ -1,13 +1,19 @@
 import os
+import time
 import pytest
-from fastapi.testclient import TestClient
 
 from hub.session_store import create_default_store
 
 
+@pytest.fixture(scope='module')
+def store():
+    # One connected store (ping, script registration, index migration) for the module
+    return create_default_store()
+
+
+@pytest.mark.io
 @pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
-def test_redis_session_store_basic_lifecycle():
-    store = create_default_store()
+def test_redis_session_store_basic_lifecycle(store):
     # Must be Redis-backed for this test
     assert store is not None
 
@@ -21,3 +27,69 @@ def test_redis_session_store_basic_lifecycle():
     ok = store.terminate_session(sid)
     assert ok is True
     assert store.get_session(sid) is None
+
+
+@pytest.mark.io
+@pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
+def test_redis_session_store_since_seconds_uses_index(store):
+    s = store.create_session(user='recent', role='Viewer')
+    sid = s['session_id']
+    try:
+        assert any(item.get('session_id') == sid for item in store.list_sessions(since_seconds=60))
+        # scores are expiry times: pretend the session was created an hour ago
+        store.client.zadd(store.index_key, {sid: time.time() + store.ttl_seconds - 3600})
+        assert not any(item.get('session_id') == sid for item in store.list_sessions(since_seconds=60))
+        assert any(item.get('session_id') == sid for item in store.list_sessions())
+    finally:
+        store.terminate_session(sid)
+
+
+@pytest.mark.io
+@pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
+def test_redis_session_store_skips_expired_sessions(store):
+    s = store.create_session(user='expiring', role='Viewer')
+    sid = s['session_id']
+    try:
+        assert 0 < store.client.ttl(store._key(sid)) <= store.ttl_seconds
+        # an expired index entry is ignored even while its blob still exists
+        store.client.zadd(store.index_key, {sid: time.time() - 1})
+        assert not any(item.get('session_id') == sid for item in store.list_sessions())
+    finally:
+        store.terminate_session(sid)
+
+
+@pytest.mark.io
+@pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
+def test_buffered_redis_session_store_flushes_in_one_batch():
+    from hub.session_store import BufferedRedisSessionStore
+
+    store = BufferedRedisSessionStore(os.getenv('REDIS_URL'), flush_interval=60)
+    sids = [store.create_session(user=f'burst{i}', role='Viewer')['session_id'] for i in range(5)]
+    try:
+        # buffered sessions are readable before they reach Redis
+        assert store.get_session(sids[0]) is not None
+        assert store.client.get(store._key(sids[0])) is None
+        store.flush()
+        assert all(store.client.get(store._key(sid)) is not None for sid in sids)
+        assert store.terminate_session(sids[0]) is True
+        assert store.get_session(sids[0]) is None
+    finally:
+        for sid in sids:
+            store.terminate_session(sid)
+
+
+@pytest.mark.io
+@pytest.mark.skipif(not os.getenv('REDIS_URL'), reason='REDIS_URL not set')
+def test_redis_session_store_migrates_legacy_ids_with_ttl(store):
+    from hub.session_store import RedisSessionStore
+
+    sid = 'legacy-migration-test'
+    store.client.set(store._key(sid), b'{"session_id": "legacy-migration-test"}')
+    store.client.sadd(store.legacy_set_key, sid)
+    try:
+        migrated = RedisSessionStore(os.getenv('REDIS_URL'))
+        assert migrated.client.zscore(migrated.index_key, sid) is not None
+        assert 0 < migrated.client.ttl(migrated._key(sid)) <= migrated.ttl_seconds
+        assert not migrated.client.exists(migrated.legacy_set_key)
+    finally:
+        store.terminate_session(sid)
@@ -0,0 +1,30 @@
+from hub import main as hub_main
+from hub.main import _tail_lines
+
+
+def _readlines(path, n):
+    with open(path, encoding='utf-8', newline='') as f:
+        return [ln.rstrip('\n') for ln in f.readlines()[-n:]]
+
+
+def test_tail_lines_spans_blocks(tmp_path):
+    path = tmp_path / 'audit.log'
+    path.write_text(''.join(f'{{"i": {i}}}\n' for i in range(2000)), encoding='utf-8')
+    assert path.stat().st_size > hub_main._TAIL_BLOCK_SIZE
+    for n in (1, 5, 1000, 1999, 2000, 5000, 0, -3):
+        assert _tail_lines(str(path), n) == _readlines(path, n)
+
+
+def test_tail_lines_without_trailing_newline(tmp_path, monkeypatch):
+    monkeypatch.setattr(hub_main, '_TAIL_BLOCK_SIZE', 4)
+    path = tmp_path / 'audit.log'
+    path.write_text('first\nsecond\nthird', encoding='utf-8')
+    assert _tail_lines(str(path), 2) == ['second', 'third']
+    assert _tail_lines(str(path), 10) == ['first', 'second', 'third']
+
+
+def test_tail_lines_keeps_unicode_line_separators(tmp_path, monkeypatch):
+    monkeypatch.setattr(hub_main, '_TAIL_BLOCK_SIZE', 8)
+    path = tmp_path / 'audit.log'
+    path.write_text('{"a": "x"}\n{"a": "abc\u2028def"}\n{"a": "n\x85l"}\n', encoding='utf-8')
+    assert _tail_lines(str(path), 2) == ['{"a": "abc\u2028def"}', '{"a": "n\x85l"}']